@@ -1,125 +1,400 @@
 """
 Fusion 360 MCP Bridge Add-in
 
-This add-in runs inside Fusion 360 and monitors the mcp_comm/ directory
-for command files written by the standalone MCP server. It executes
-commands using the Fusion 360 API and writes response files back.
+This add-in runs inside Fusion 360 and serves commands from the standalone
+MCP server over a local socket (mcp_comm/bridge.sock, or a loopback TCP port
+where Unix sockets are unavailable). Each request is a length-prefixed JSON
+frame answered by a length-prefixed JSON frame. The older file-based
+transport -- command files (or batch files holding several commands) dropped
+into mcp_comm/ and answered with response files -- is still monitored as a
+fallback while LEGACY_FILE_TRANSPORT is set.
 
 No external pip packages are required -- only stdlib and adsk.* modules.
+If watchdog happens to be importable, the file monitor uses it to wake on
+new command files instead of rescanning mcp_comm/; likewise orjson is
+preferred over the stdlib json module when present, and msgpack enables
+MessagePack command/response files (advertised in server_status.json).
 """
 
 import adsk.core
 import adsk.fusion
+import atexit
 import os
 import traceback
 import threading
 import time
 import json
+import hmac
+import queue
+import secrets
+import socket
+import socketserver
+import struct
+import tempfile
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
 from pathlib import Path
 
+try:
+    from watchdog.events import PatternMatchingEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    PatternMatchingEventHandler = None
+    Observer = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 app = adsk.core.Application.get()
 ui = app.userInterface
 
-server_thread = None
-server_running = False
-handlers = []
-message_command_handlers = []
+# Lifecycle state is replaced as a whole under _state_lock, so readers can
+# take one consistent snapshot with `state = _state`.
+ServerState = namedtuple("ServerState", ["running", "started", "thread"])
+_state = ServerState(running=False, started=None, thread=None)
+_state_lock = threading.Lock()
+
+bridge_server = None
+bridge_thread = None
+# Secret a client must send as its first frame before the bridge runs any
+# command for it; regenerated on every start and published only in
+# server_status.json. On Windows the bridge is a loopback TCP port that any
+# local process can reach, so the token is what keeps it private.
+bridge_token = None
+# Event handlers must stay referenced while Fusion can still call them.
+# UI handlers are keyed by role, so reopening the dialog replaces the previous
+# set; message box handlers are keyed by their command id and released once
+# that command has been destroyed.
+handlers = {}
+message_command_handlers = {}
+_finished_message_commands = []
+
+# Fusion API calls are serialized no matter which transport they arrive on.
+command_lock = threading.Lock()
+
+# Keep polling mcp_comm/ for command files so clients that predate the
+# socket bridge keep working.
+LEGACY_FILE_TRANSPORT = True
+
+# Set MCP_BRIDGE_DEBUG=1 to include tracebacks in error results sent back to
+# the client. They are always written to mcp_comm/monitor.txt.
+_DEBUG = os.environ.get("MCP_BRIDGE_DEBUG") == "1"
 
 # Resolve paths: MCPserve/commands/ -> MCPserve/ -> fusion-mcp-server/
 ADDON_DIR = Path(__file__).resolve().parent.parent
 WORKSPACE_DIR = ADDON_DIR.parent
 COMM_DIR = WORKSPACE_DIR / "mcp_comm"
+BRIDGE_SOCKET = COMM_DIR / "bridge.sock"
+# sun_path holds 104 bytes on macOS and 108 on Linux, including the NUL.
+MAX_SOCKET_PATH = 103
+
+# Frame header: payload length as a little-endian unsigned 32-bit int.
+_FRAME_HEADER = struct.Struct("<I")
+# Requests are small; a larger length is a corrupt or hostile header, and
+# the connection is closed rather than buffering it.
+MAX_FRAME_BYTES = 16 * 1024 * 1024
+
+
+def _set_state(**changes):
+    """Replace fields of the server state snapshot."""
+    global _state
+    with _state_lock:
+        _state = _state._replace(**changes)
 
 
 def _ensure_comm_dir():
     COMM_DIR.mkdir(parents=True, exist_ok=True)
 
 
+# Log files stay open for the life of the add-in. Lines are buffered and
+# flushed at most once per LOG_FLUSH_INTERVAL_SECONDS, when the file monitor
+# goes idle, and on shutdown.
+LOG_FLUSH_INTERVAL_SECONDS = 1.0
+_log_handles = {}
+_log_lock = threading.Lock()
+_last_log_flush = 0.0
+
+
 def _log(filename, message):
     """Append a timestamped log line to a file in mcp_comm/."""
+    global _last_log_flush
     try:
-        _ensure_comm_dir()
-        with open(COMM_DIR / filename, "a") as f:
+        with _log_lock:
+            f = _log_handles.get(filename)
+            if f is None:
+                _ensure_comm_dir()
+                f = _log_handles[filename] = open(COMM_DIR / filename, "a", buffering=8192)
             f.write(f"[{time.ctime()}] {message}\n")
+
+            now = time.monotonic()
+            if now - _last_log_flush >= LOG_FLUSH_INTERVAL_SECONDS:
+                for handle in _log_handles.values():
+                    handle.flush()
+                _last_log_flush = now
     except Exception:
         pass
 
 
+def _flush_logs():
+    """Push buffered log lines to disk."""
+    try:
+        with _log_lock:
+            for handle in _log_handles.values():
+                handle.flush()
+    except Exception:
+        pass
+
+
+@atexit.register
+def _close_logs():
+    """Flush and close every open log file."""
+    with _log_lock:
+        for handle in _log_handles.values():
+            try:
+                handle.close()
+            except Exception:
+                pass
+        _log_handles.clear()
+
+
+def _json_dumps(data, pretty=False):
+    """Serialize `data` to UTF-8 JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(data, indent=2).encode("utf-8")
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def _json_loads(raw):
+    """Parse JSON from bytes or str, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+# Cleared the first time the filesystem or /proc rejects the O_TMPFILE path.
+_tmpfile_link_supported = hasattr(os, "O_TMPFILE")
+
+
+def _link_tmpfile(path, data):
+    """Publish `data` as a new file at `path` via an O_TMPFILE inode.
+
+    Returns False when this isn't possible (unsupported filesystem, no
+    usable /proc, or `path` already exists) so the caller can fall back to
+    a rename.
+    """
+    global _tmpfile_link_supported
+    try:
+        dir_fd = os.open(os.path.dirname(path) or ".", os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return False
+    try:
+        try:
+            fd = os.open(".", os.O_TMPFILE | os.O_WRONLY, 0o644, dir_fd=dir_fd)
+        except OSError:
+            _tmpfile_link_supported = False
+            return False
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            # Without a dir fd CPython calls plain link(), which fails on
+            # the /proc magic link with EXDEV; with dst_dir_fd it uses
+            # linkat(AT_SYMLINK_FOLLOW) and links the open inode.
+            os.link(f"/proc/self/fd/{fd}", os.path.basename(path), dst_dir_fd=dir_fd)
+            return True
+        except FileExistsError:
+            return False
+        except OSError:
+            _tmpfile_link_supported = False
+            return False
+        finally:
+            os.close(fd)
+    finally:
+        os.close(dir_fd)
+
+
+def _write_bytes_atomic(path, data):
+    """Write bytes to a temp file and rename it over `path`.
+
+    On Linux, new files are instead written as an unnamed O_TMPFILE inode
+    and linked into place, so a crash never leaves a stray .tmp behind.
+    """
+    if _tmpfile_link_supported and _link_tmpfile(path, data):
+        return
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _write_json_atomic(path, data, pretty=False):
+    """Write JSON to a temp file and rename it over `path`.
+
+    Responses are only read by the MCP server, so they are compact unless
+    `pretty` is set.
+    """
+    _write_bytes_atomic(path, _json_dumps(data, pretty=pretty))
+
+
+def _write_msgpack_atomic(path, data):
+    """Write MessagePack to a temp file and rename it over `path`."""
+    _write_bytes_atomic(path, msgpack.packb(data, use_bin_type=True))
+
+
+# Extensions accepted for command_<id> files; the response uses the same one.
+COMMAND_FILE_EXTENSIONS = (".json", ".msgpack") if msgpack is not None else (".json",)
+
+
+# Fields of server_status.json that never change while Fusion is running.
+# _write_status only fills in the per-write keys.
+_STATUS_TEMPLATE = {
+    "status": None,
+    "started_at": None,
+    "fusion_version": app.version,
+    "bridge_address": None,
+    "bridge_token": None,
+    "payload_formats": [ext[1:] for ext in COMMAND_FILE_EXTENSIONS],
+    "batch_commands": True,
+    "available_resources": [
+        "fusion://active-document-info",
+        "fusion://design-structure",
+        "fusion://parameters",
+    ],
+    "available_tools": [
+        "check_connection",
+        "message_box",
+        "create_new_sketch",
+        "create_parameter",
+        "create_box",
+        "execute_script",
+    ],
+    "available_prompts": [
+        "create_sketch_prompt",
+        "parameter_setup_prompt",
+    ],
+}
+
+
 def _write_status(status="running"):
     """Write the server_status.json file so the MCP server can detect us."""
     _ensure_comm_dir()
-    status_data = {
-        "status": status,
-        "started_at": time.ctime(),
-        "fusion_version": app.version,
-        "available_resources": [
-            "fusion://active-document-info",
-            "fusion://design-structure",
-            "fusion://parameters",
-        ],
-        "available_tools": [
-            "check_connection",
-            "message_box",
-            "create_new_sketch",
-            "create_parameter",
-            "create_box",
-            "execute_script",
-        ],
-        "available_prompts": [
-            "create_sketch_prompt",
-            "parameter_setup_prompt",
-        ],
-    }
-    (COMM_DIR / "server_status.json").write_text(json.dumps(status_data, indent=2))
+    status_data = _STATUS_TEMPLATE
+    status_data["status"] = status
+    started = _state.started
+    status_data["started_at"] = time.ctime(started) if started else None
+    status_data["bridge_address"] = _bridge_address()
+    status_data["bridge_token"] = bridge_token if bridge_server is not None else None
+    _write_json_atomic(COMM_DIR / "server_status.json", status_data, pretty=True)
 
 
 # ── Command Handlers ─────────────────────────────────────────────────
 
+_LIST_RESOURCES = (
+    "fusion://active-document-info",
+    "fusion://design-structure",
+    "fusion://parameters",
+)
+
+_LIST_TOOLS = (
+    {"name": "message_box", "description": "Display a message box in Fusion 360"},
+    {"name": "create_new_sketch", "description": "Create a new sketch on the specified plane"},
+    {"name": "create_parameter", "description": "Create a new parameter in the active design"},
+)
+
+_LIST_PROMPTS = (
+    {"name": "create_sketch_prompt", "description": "Expert guidance for creating sketches"},
+    {"name": "parameter_setup_prompt", "description": "Expert guidance for setting up parameters"},
+)
+
+# Discovery commands never touch Fusion, so their response files are
+# serialized once here, per file format, and written verbatim by the file
+# monitor.
+_STATIC_RESULTS = {
+    "list_resources": _LIST_RESOURCES,
+    "list_tools": _LIST_TOOLS,
+    "list_prompts": _LIST_PROMPTS,
+}
+_STATIC_RESPONSES = {
+    ".json": {
+        name: _json_dumps({"result": result}) for name, result in _STATIC_RESULTS.items()
+    },
+}
+if msgpack is not None:
+    _STATIC_RESPONSES[".msgpack"] = {
+        name: msgpack.packb({"result": result}, use_bin_type=True)
+        for name, result in _STATIC_RESULTS.items()
+    }
+
+# command name -> handler taking the request's params dict
+_DISPATCH = {
+    "list_resources": lambda params: _LIST_RESOURCES,
+    "list_tools": lambda params: _LIST_TOOLS,
+    "list_prompts": lambda params: _LIST_PROMPTS,
+    "message_box": lambda params: _cmd_message_box(params.get("message", "")),
+    "create_new_sketch": lambda params: _cmd_create_sketch(params.get("plane_name", "XY")),
+    "create_parameter": lambda params: _cmd_create_parameter(
+        params.get("name", f"Param_{int(time.time()) % 10000}"),
+        params.get("expression", "10"),
+        params.get("unit", "mm"),
+        params.get("comment", ""),
+    ),
+    "create_box": lambda params: _cmd_create_box(
+        params.get("length", 10),
+        params.get("width", 10),
+        params.get("height", 10),
+        params.get("name", "Box"),
+    ),
+    "execute_script": lambda params: _cmd_execute_script(params.get("script", "")),
+    "read_resource": lambda params: _cmd_read_resource(params.get("uri", "")),
+    "get_prompt": lambda params: _cmd_get_prompt(params.get("name", ""), params.get("args", {})),
+}
+
+
 def handle_command(command, params):
     """Dispatch a command and return its result."""
-    if command == "list_resources":
-        return [
-            "fusion://active-document-info",
-            "fusion://design-structure",
-            "fusion://parameters",
-        ]
-    elif command == "list_tools":
-        return [
-            {"name": "message_box", "description": "Display a message box in Fusion 360"},
-            {"name": "create_new_sketch", "description": "Create a new sketch on the specified plane"},
-            {"name": "create_parameter", "description": "Create a new parameter in the active design"},
-        ]
-    elif command == "list_prompts":
-        return [
-            {"name": "create_sketch_prompt", "description": "Expert guidance for creating sketches"},
-            {"name": "parameter_setup_prompt", "description": "Expert guidance for setting up parameters"},
-        ]
-    elif command == "message_box":
-        return _cmd_message_box(params.get("message", ""))
-    elif command == "create_new_sketch":
-        return _cmd_create_sketch(params.get("plane_name", "XY"))
-    elif command == "create_parameter":
-        return _cmd_create_parameter(
-            params.get("name", f"Param_{int(time.time()) % 10000}"),
-            params.get("expression", "10"),
-            params.get("unit", "mm"),
-            params.get("comment", ""),
-        )
-    elif command == "create_box":
-        return _cmd_create_box(
-            params.get("length", 10),
-            params.get("width", 10),
-            params.get("height", 10),
-            params.get("name", "Box"),
-        )
-    elif command == "execute_script":
-        return _cmd_execute_script(params.get("script", ""))
-    elif command == "read_resource":
-        return _cmd_read_resource(params.get("uri", ""))
-    elif command == "get_prompt":
-        return _cmd_get_prompt(params.get("name", ""), params.get("args", {}))
-    else:
+    handler = _DISPATCH.get(command)
+    if handler is None:
         return {"error": f"Unknown command: {command}"}
+    return handler(params)
+
+
+def _get_design():
+    """Return (doc, design) for the active document; either may be None."""
+    doc = app.activeDocument
+    design = None
+    if doc:
+        design = adsk.fusion.Design.cast(
+            doc.products.itemByProductType("DesignProductType")
+        )
+    return doc, design
+
+
+def _run_command(command, params):
+    """Run a command while holding the lock shared by all transports."""
+    with command_lock:
+        return handle_command(command, params)
+
+
+def _error_result(message):
+    """Log the active exception and return `message` as the command result.
+
+    The traceback is appended to the result only when _DEBUG is set.
+    """
+    tb = traceback.format_exc()
+    _log("monitor.txt", f"{message}\n{tb}")
+    if _DEBUG:
+        return f"{message}\n{tb}"
+    return message
 
 
 def _cmd_message_box(message):
@@ -132,12 +407,9 @@ def _cmd_message_box(message):
 
 def _cmd_create_sketch(plane_name):
     try:
-        doc = app.activeDocument
+        doc, design = _get_design()
         if not doc:
             return "No active document"
-        design = adsk.fusion.Design.cast(
-            doc.products.itemByProductType("DesignProductType")
-        )
         if not design:
             return "Active document is not a design document"
         root = design.rootComponent
@@ -168,12 +440,9 @@ def _cmd_create_sketch(plane_name):
 
 def _cmd_create_parameter(name, expression, unit, comment):
     try:
-        doc = app.activeDocument
+        doc, design = _get_design()
         if not doc:
             return "No active document"
-        design = adsk.fusion.Design.cast(
-            doc.products.itemByProductType("DesignProductType")
-        )
         if not design:
             return "Active document is not a design document"
 
@@ -197,12 +466,9 @@ def _cmd_create_parameter(name, expression, unit, comment):
 
 def _cmd_create_box(length, width, height, name):
     try:
-        doc = app.activeDocument
+        doc, design = _get_design()
         if not doc:
             return "No active document"
-        design = adsk.fusion.Design.cast(
-            doc.products.itemByProductType("DesignProductType")
-        )
         if not design:
             return "Active document is not a design document"
         root = design.rootComponent
@@ -213,13 +479,8 @@ def _cmd_create_box(length, width, height, name):
 
         lines = sketch.sketchCurves.sketchLines
         p0 = adsk.core.Point3D.create(0, 0, 0)
-        p1 = adsk.core.Point3D.create(length / 10.0, 0, 0)
         p2 = adsk.core.Point3D.create(length / 10.0, width / 10.0, 0)
-        p3 = adsk.core.Point3D.create(0, width / 10.0, 0)
-        lines.addByTwoPoints(p0, p1)
-        lines.addByTwoPoints(p1, p2)
-        lines.addByTwoPoints(p2, p3)
-        lines.addByTwoPoints(p3, p0)
+        lines.addTwoPointRectangle(p0, p2)
 
         profile = sketch.profiles.item(0)
         extrudes = root.features.extrudeFeatures
@@ -238,19 +499,33 @@ def _cmd_create_box(length, width, height, name):
 
         return f"Box created: {name} ({length} x {width} x {height} mm)"
     except Exception as e:
-        return f"Error creating box: {e}\n{traceback.format_exc()}"
+        return _error_result(f"Error creating box: {e}")
+
+
+# Compiled execute_script code objects, keyed by source, most recent last.
+SCRIPT_CACHE_SIZE = 128
+_script_cache = OrderedDict()
+
+
+def _compile_script(script):
+    """Compile `script`, reusing the code object if it was sent before."""
+    code = _script_cache.get(script)
+    if code is not None:
+        _script_cache.move_to_end(script)
+        return code
+    code = compile(script, "<mcp>", "exec")
+    _script_cache[script] = code
+    if len(_script_cache) > SCRIPT_CACHE_SIZE:
+        _script_cache.popitem(last=False)
+    return code
 
 
 def _cmd_execute_script(script):
     if not script.strip():
         return "No script provided"
     try:
-        doc = app.activeDocument
-        design = None
-        if doc:
-            design = adsk.fusion.Design.cast(
-                doc.products.itemByProductType("DesignProductType")
-            )
+        code = _compile_script(script)
+        doc, design = _get_design()
         local_vars = {
             "app": app,
             "ui": ui,
@@ -259,10 +534,14 @@ def _cmd_execute_script(script):
             "design": design,
             "result": "Script executed successfully",
         }
-        exec(script, {"__builtins__": __builtins__}, local_vars)
+        exec(code, {"__builtins__": __builtins__}, local_vars)
         return str(local_vars.get("result", "Script executed successfully"))
     except Exception as e:
-        return f"Script error: {e}\n{traceback.format_exc()}"
+        return _error_result(f"Script error: {e}")
+
+
+_PARAMETER_FIELDS = ("name", "value", "expression", "unit", "comment")
+_get_parameter_fields = attrgetter(*_PARAMETER_FIELDS)
 
 
 def _cmd_read_resource(uri):
@@ -287,12 +566,9 @@ def _cmd_read_resource(uri):
 
     elif uri == "fusion://design-structure":
         try:
-            doc = app.activeDocument
+            doc, design = _get_design()
             if not doc:
                 return {"error": "No active document"}
-            design = adsk.fusion.Design.cast(
-                doc.products.itemByProductType("DesignProductType")
-            )
             if not design:
                 return {"error": "No design in document"}
             root = design.rootComponent
@@ -313,23 +589,15 @@ def _cmd_read_resource(uri):
 
     elif uri == "fusion://parameters":
         try:
-            doc = app.activeDocument
+            doc, design = _get_design()
             if not doc:
                 return {"error": "No active document"}
-            design = adsk.fusion.Design.cast(
-                doc.products.itemByProductType("DesignProductType")
-            )
             if not design:
                 return {"error": "No design in document"}
-            params = []
-            for p in design.allParameters:
-                params.append({
-                    "name": p.name,
-                    "value": p.value,
-                    "expression": p.expression,
-                    "unit": p.unit,
-                    "comment": p.comment,
-                })
+            params = [
+                dict(zip(_PARAMETER_FIELDS, _get_parameter_fields(p)))
+                for p in list(design.allParameters)
+            ]
             return {"parameters": params}
         except Exception as e:
             return {"error": str(e)}
@@ -373,9 +641,25 @@ def _cmd_get_prompt(name, prompt_args):
 
 # ── Message Box via Fusion Command API ────────────────────────────────
 
+def _release_finished_message_commands():
+    """Drop handlers and definitions of message box commands that have closed."""
+    cmd_defs = ui.commandDefinitions
+    while _finished_message_commands:
+        cmd_id = _finished_message_commands.pop()
+        message_command_handlers.pop(cmd_id, None)
+        try:
+            cmd_def = cmd_defs.itemById(cmd_id)
+            if cmd_def:
+                cmd_def.deleteMe()
+        except Exception as e:
+            _log("message_debug.txt", f"Error deleting {cmd_id}: {e}")
+
+
 def _show_message_box(message):
     """Display a message in Fusion 360 using the Command API (thread-safe)."""
     try:
+        _release_finished_message_commands()
+
         cmd_id = f"MCPMsg_{int(time.time() * 1000)}"
         cmd_defs = ui.commandDefinitions
         existing = cmd_defs.itemById(cmd_id)
@@ -384,9 +668,9 @@ def _show_message_box(message):
 
         cmd_def = cmd_defs.addButtonDefinition(cmd_id, "MCP Message", message, "")
 
-        handler = _MsgCreatedHandler(message)
+        handler = _MsgCreatedHandler(message, cmd_id)
         cmd_def.commandCreated.add(handler)
-        message_command_handlers.append(handler)
+        message_command_handlers[cmd_id] = [handler]
 
         cmd_def.execute()
     except Exception as e:
@@ -405,17 +689,33 @@ class _MsgExecuteHandler(adsk.core.CommandEventHandler):
             _log("message_debug.txt", f"Execute handler error: {e}")
 
 
+class _MsgDestroyHandler(adsk.core.CommandEventHandler):
+    def __init__(self, cmd_id):
+        super().__init__()
+        self.cmd_id = cmd_id
+
+    def notify(self, args):
+        # Fusion is still dispatching this command's events, so only mark it;
+        # the next _show_message_box call releases it.
+        _finished_message_commands.append(self.cmd_id)
+
+
 class _MsgCreatedHandler(adsk.core.CommandCreatedEventHandler):
-    def __init__(self, message):
+    def __init__(self, message, cmd_id):
         super().__init__()
         self.message = message
+        self.cmd_id = cmd_id
 
     def notify(self, args):
         try:
             cmd = args.command
             exe_handler = _MsgExecuteHandler(self.message)
             cmd.execute.add(exe_handler)
-            message_command_handlers.append(exe_handler)
+            destroy_handler = _MsgDestroyHandler(self.cmd_id)
+            cmd.destroy.add(destroy_handler)
+            message_command_handlers.setdefault(self.cmd_id, []).extend(
+                [exe_handler, destroy_handler]
+            )
             cmd.isEnabled = True
             cmd.isVisible = False
         except Exception as e:
@@ -424,109 +724,612 @@ class _MsgCreatedHandler(adsk.core.CommandCreatedEventHandler):
 
 # ── File Monitor Thread ───────────────────────────────────────────────
 
-def _file_monitor():
-    """Poll mcp_comm/ for command files and process them."""
-    _log("monitor.txt", "File monitor started")
-    comm_dir = str(COMM_DIR)
+# Names of files reported by the watchdog observer, consumed by _file_monitor.
+_command_events = queue.Queue()
+
+# Polling fallback bounds: back off from MIN to MAX while idle, drop back to
+# MIN as soon as a pass finds work. stop_server sets _monitor_wake.
+MIN_POLL_INTERVAL_SECONDS = 0.001
+MAX_POLL_INTERVAL_SECONDS = 0.5
+# With watchdog: how long one wait for observer events may block (bounds how
+# long stop_server waits for the thread), and how often the directory is
+# rescanned anyway for files the observer never reported.
+EVENT_WAIT_SECONDS = 0.5
+SAFETY_RESCAN_SECONDS = 5.0
+_monitor_wake = threading.Event()
+
+# Ids of command files that already have a response, so the monitor can skip
+# them without stat'ing processed_/response_ files on every pass. Full scans
+# drop ids whose command file is gone, so the set tracks the directory.
+_handled_command_ids = set()
+
+if PatternMatchingEventHandler is not None:
+    class _CommandFileHandler(PatternMatchingEventHandler):
+        """Queue command and batch files as soon as they appear in mcp_comm/."""
+
+        def __init__(self):
+            super().__init__(
+                patterns=[f"command_*{ext}" for ext in COMMAND_FILE_EXTENSIONS]
+                + [f"batch_*{ext}" for ext in COMMAND_FILE_EXTENSIONS]
+                + ["message_box.txt"],
+                ignore_patterns=["batch_response_*"],
+                ignore_directories=True,
+            )
+
+        def on_created(self, event):
+            _command_events.put(os.path.basename(event.src_path))
+
+        def on_moved(self, event):
+            # Writers publish atomically by renaming a temp file into place.
+            _command_events.put(os.path.basename(event.dest_path))
+
+
+def _start_observer(comm_dir):
+    """Watch mcp_comm/ with watchdog, or return None to fall back to polling."""
+    if Observer is None:
+        return None
+    try:
+        observer = Observer()
+        observer.schedule(_CommandFileHandler(), comm_dir, recursive=False)
+        observer.start()
+        return observer
+    except Exception as e:
+        _log("monitor.txt", f"watchdog unavailable, polling instead: {e}")
+        return None
+
 
-    while server_running:
+def _wait_for_command_events(timeout):
+    """Block until the observer reports files, then return every queued name."""
+    try:
+        names = [_command_events.get(timeout=timeout)]
+    except queue.Empty:
+        return []
+    while True:
         try:
-            _ensure_comm_dir()
+            names.append(_command_events.get_nowait())
+        except queue.Empty:
+            return names
+
+
+def _strip_prefix(fname, prefix):
+    """Return <id> for `<prefix><id><ext>` with a known extension, else None."""
+    if not fname.startswith(prefix):
+        return None
+    stem, ext = os.path.splitext(fname)
+    if ext not in COMMAND_FILE_EXTENSIONS:
+        return None
+    return stem[len(prefix):]
+
+
+def _command_file_key(fname):
+    """Return the _handled_command_ids key for a command or batch file, else None.
+
+    Command files are keyed by their bare id and batch files by
+    "batch_<id>", so the two numbering schemes can't collide.
+    """
+    cmd_id = _strip_prefix(fname, "command_")
+    if cmd_id is not None:
+        return cmd_id
+    if fname.startswith("batch_response_"):
+        return None
+    batch_id = _strip_prefix(fname, "batch_")
+    if batch_id is not None:
+        return f"batch_{batch_id}"
+    return None
+
+
+def _scan_command_files(comm_dir):
+    """List command/batch files (and message_box.txt) in mcp_comm/, oldest id first."""
+    with os.scandir(comm_dir) as it:
+        names = [
+            e.name for e in it
+            if _command_file_key(e.name) is not None
+            or e.name == "message_box.txt"
+        ]
+    names.sort()
+    return names
+
+
+def _load_handled_command_ids(comm_dir):
+    """Return the keys that already have a processed_ or response file."""
+    ids = set()
+    with os.scandir(comm_dir) as it:
+        for entry in it:
+            cmd_id = _strip_prefix(entry.name, "processed_command_")
+            if cmd_id is None:
+                cmd_id = _strip_prefix(entry.name, "response_")
+            if cmd_id is None:
+                batch_id = _strip_prefix(entry.name, "processed_batch_")
+                if batch_id is None:
+                    batch_id = _strip_prefix(entry.name, "batch_response_")
+                if batch_id is not None:
+                    cmd_id = f"batch_{batch_id}"
+            if cmd_id is not None:
+                ids.add(cmd_id)
+    return ids
+
+
+def _process_message_file(comm_dir):
+    """Show the message in message_box.txt and archive the file."""
+    msg_file = os.path.join(comm_dir, "message_box.txt")
+    try:
+        with open(msg_file, "r") as f:
+            msg = f.read().strip()
+        if msg:
+            _show_message_box(msg)
+        processed = os.path.join(comm_dir, f"processed_message_{int(time.time())}.txt")
+        os.rename(msg_file, processed)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        _log("monitor.txt", f"Error processing message_box.txt: {e}")
 
-            # Process message_box.txt shortcut
-            msg_file = os.path.join(comm_dir, "message_box.txt")
-            if os.path.exists(msg_file):
-                try:
-                    with open(msg_file, "r") as f:
-                        msg = f.read().strip()
-                    if msg:
-                        _show_message_box(msg)
-                    processed = os.path.join(comm_dir, f"processed_message_{int(time.time())}.txt")
-                    os.rename(msg_file, processed)
-                except Exception as e:
-                    _log("monitor.txt", f"Error processing message_box.txt: {e}")
-
-            # Process command_*.json files
-            for fname in os.listdir(comm_dir):
-                if not (fname.startswith("command_") and fname.endswith(".json")):
-                    continue
-
-                command_file = os.path.join(comm_dir, fname)
-                cmd_id = fname[len("command_"):-len(".json")]
-                processed_file = os.path.join(comm_dir, f"processed_command_{cmd_id}.json")
-                response_file = os.path.join(comm_dir, f"response_{cmd_id}.json")
-
-                if os.path.exists(processed_file) or os.path.exists(response_file):
-                    continue
 
-                try:
-                    with open(command_file, "r") as f:
-                        data = json.load(f)
+def _read_command_file(command_file):
+    """Read and parse a command file (runs on the I/O pool)."""
+    raw = Path(command_file).read_bytes()
+    if command_file.endswith(".msgpack"):
+        return msgpack.unpackb(raw)
+    return _json_loads(raw)
 
-                    command = data.get("command")
-                    params = data.get("params", {})
-                    _log("monitor.txt", f"Processing: {command} (id={cmd_id})")
 
-                    result = handle_command(command, params)
+def _publish_response(response_file, response, command_file=None, processed_file=None):
+    """Write a response file, then archive the command (runs on the I/O pool).
+
+    `response` is either a dict to serialize in the format named by the
+    response file's extension, or pre-encoded bytes.
+    """
+    try:
+        if isinstance(response, bytes):
+            _write_bytes_atomic(response_file, response)
+        elif response_file.endswith(".msgpack"):
+            _write_msgpack_atomic(response_file, response)
+        else:
+            _write_json_atomic(response_file, response)
+        if processed_file:
+            os.rename(command_file, processed_file)
+    except Exception as e:
+        _log("monitor.txt", f"Error writing {response_file}: {e}")
 
-                    with open(response_file, "w") as f:
-                        json.dump({"result": result}, f, indent=2)
 
-                    os.rename(command_file, processed_file)
+def _take_parsed(fname, key, ext, parsed, response_file, io_pool):
+    """Return (data, answered) for a command or batch file read on `io_pool`.
 
-                except json.JSONDecodeError as e:
-                    with open(response_file, "w") as f:
-                        json.dump({"error": f"Invalid JSON: {e}"}, f)
-                except Exception as e:
-                    _log("monitor.txt", f"Error processing {fname}: {e}\n{traceback.format_exc()}")
-                    try:
-                        with open(response_file, "w") as f:
-                            json.dump({"error": str(e)}, f)
-                    except Exception:
-                        pass
+    `data` is None when there is nothing to run: either the file is gone or
+    can't be read yet (answered is False; a later rescan retries it), or it
+    failed to decode (answered is True; an error response is queued and
+    `key` is marked handled).
+    """
+    try:
+        return parsed.result(), False
+    except FileNotFoundError:
+        # Already picked up via a duplicate filesystem event.
+        return None, False
+    except OSError as e:
+        # e.g. still locked by an antivirus scan.
+        _log("monitor.txt", f"Cannot read {fname}, will retry: {e}")
+        return None, False
+    except ValueError as e:
+        # JSONDecodeError (json or orjson), invalid UTF-8, or a malformed
+        # MessagePack payload.
+        fmt = "MessagePack" if ext == ".msgpack" else "JSON"
+        error = f"Invalid {fmt}: {e}"
+    except Exception as e:
+        # e.g. RecursionError on deeply nested input; answer it rather than
+        # retrying it on every pass.
+        _log("monitor.txt", f"Error reading {fname}: {e}\n{traceback.format_exc()}")
+        error = str(e)
+    _handled_command_ids.add(key)
+    io_pool.submit(_publish_response, response_file, {"error": error})
+    return None, True
+
+
+def _process_command_file(comm_dir, fname, parsed, io_pool):
+    """Run one command_<id>.<ext> file and queue response_<id>.<ext>.
+
+    Returns True if the file was answered, False if it was skipped (already
+    handled, or unreadable for now and left for a later rescan).
+
+    `parsed` is the future returned by submitting _read_command_file to
+    `io_pool`; the response is written on the pool too, so only the Fusion
+    API call itself runs on the monitor thread.
+    """
+    command_file = os.path.join(comm_dir, fname)
+    cmd_id, ext = os.path.splitext(fname[len("command_"):])
+    processed_file = os.path.join(comm_dir, f"processed_command_{cmd_id}{ext}")
+    response_file = os.path.join(comm_dir, f"response_{cmd_id}{ext}")
+
+    if cmd_id in _handled_command_ids:
+        return False
+
+    data, answered = _take_parsed(fname, cmd_id, ext, parsed, response_file, io_pool)
+    if data is None:
+        return answered
+
+    try:
+        command = data.get("command")
+        params = data.get("params", {})
+        _log("monitor.txt", f"Processing: {command} (id={cmd_id})")
+
+        response = _STATIC_RESPONSES[ext].get(command)
+        if response is None:
+            response = {"result": _run_command(command, params)}
+        _handled_command_ids.add(cmd_id)
+        io_pool.submit(_publish_response, response_file, response, command_file, processed_file)
+
+    except Exception as e:
+        _log("monitor.txt", f"Error processing {fname}: {e}\n{traceback.format_exc()}")
+        _handled_command_ids.add(cmd_id)
+        io_pool.submit(_publish_response, response_file, {"error": str(e)})
+    return True
+
+
+def _process_batch_file(comm_dir, fname, parsed, io_pool):
+    """Run every command in batch_<id>.<ext> and queue batch_response_<id>.<ext>.
+
+    The batch holds {"commands": [{"id", "command", "params"}, ...]}; the
+    response holds {"responses": [{"id", "result"|"error"}, ...]} in the
+    same order, so several queued tool calls cost one file pair. Returns
+    True if the file was answered, like _process_command_file.
+    """
+    batch_file = os.path.join(comm_dir, fname)
+    batch_id, ext = os.path.splitext(fname[len("batch_"):])
+    key = f"batch_{batch_id}"
+    processed_file = os.path.join(comm_dir, f"processed_batch_{batch_id}{ext}")
+    response_file = os.path.join(comm_dir, f"batch_response_{batch_id}{ext}")
+
+    if key in _handled_command_ids:
+        return False
+
+    data, answered = _take_parsed(fname, key, ext, parsed, response_file, io_pool)
+    if data is None:
+        return answered
+
+    try:
+        requests = data.get("commands", [])
+        _log("monitor.txt", f"Processing batch of {len(requests)} (id={batch_id})")
+        responses = []
+        for request in requests:
+            command = request.get("command")
+            try:
+                response = {"result": _run_command(command, request.get("params", {}))}
+            except Exception as e:
+                _log("monitor.txt", f"Error processing {command} in {fname}: {e}\n{traceback.format_exc()}")
+                response = {"error": str(e)}
+            response["id"] = request.get("id")
+            responses.append(response)
+        _handled_command_ids.add(key)
+        io_pool.submit(
+            _publish_response, response_file, {"responses": responses}, batch_file, processed_file
+        )
+
+    except Exception as e:
+        _log("monitor.txt", f"Error processing {fname}: {e}\n{traceback.format_exc()}")
+        _handled_command_ids.add(key)
+        io_pool.submit(_publish_response, response_file, {"error": str(e)})
+    return True
+
+
+def _file_monitor():
+    """Process command files dropped into mcp_comm/.
+
+    With watchdog installed the thread sleeps until the observer reports a
+    new file, and rescans every SAFETY_RESCAN_SECONDS in case one was lost;
+    otherwise it rescans the directory, polling quickly while
+    commands keep arriving and backing off to 0.5 s when idle. File reads,
+    decoding, encoding and response writes are handed to a small thread pool.
+    """
+    _log("monitor.txt", "File monitor started")
+    _ensure_comm_dir()
+    comm_dir = str(COMM_DIR)
+    _handled_command_ids.clear()
+    _handled_command_ids.update(_load_handled_command_ids(comm_dir))
+    observer = _start_observer(comm_dir)
+    io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="MCPBridgeIO")
+
+    # Files written before the observer started never produce events, so
+    # always begin with a full scan.
+    last_scan = float("-inf")
+    poll_interval = MIN_POLL_INTERVAL_SECONDS
+    while _state.running:
+        busy = False
+        try:
+            _ensure_comm_dir()
+            if observer is None or time.monotonic() - last_scan >= SAFETY_RESCAN_SECONDS:
+                # With an observer this catches files it never reported
+                # (event queue overflow, coalesced FSEvents).
+                names = _scan_command_files(comm_dir)
+                last_scan = time.monotonic()
+                _handled_command_ids.intersection_update(map(_command_file_key, names))
+            else:
+                names = _wait_for_command_events(EVENT_WAIT_SECONDS)
+
+            # Start parsing every new command up front so the pool reads the
+            # next files while earlier ones are running in Fusion.
+            pending = {}
+            for fname in names:
+                if fname == "message_box.txt":
+                    busy = True
+                    _process_message_file(comm_dir)
+                else:
+                    cmd_id = _command_file_key(fname)
+                    if cmd_id is None or fname in pending or cmd_id in _handled_command_ids:
+                        continue
+                    pending[fname] = io_pool.submit(
+                        _read_command_file, os.path.join(comm_dir, fname)
+                    )
+
+            # Only files actually answered count as work, so one that stays
+            # unreadable doesn't pin the poll interval at its minimum.
+            for fname, parsed in pending.items():
+                if fname.startswith("batch_"):
+                    handled = _process_batch_file(comm_dir, fname, parsed, io_pool)
+                else:
+                    handled = _process_command_file(comm_dir, fname, parsed, io_pool)
+                busy = busy or handled
+            if not busy:
+                _flush_logs()
 
         except Exception as e:
             _log("monitor.txt", f"Monitor loop error: {e}")
 
-        time.sleep(0.5)
+        if observer is None:
+            if busy:
+                poll_interval = MIN_POLL_INTERVAL_SECONDS
+            else:
+                poll_interval = min(poll_interval * 2, MAX_POLL_INTERVAL_SECONDS)
+            _monitor_wake.wait(poll_interval)
 
+    if observer is not None:
+        observer.stop()
+        observer.join(timeout=2.0)
+    io_pool.shutdown(wait=True)
     _log("monitor.txt", "File monitor stopped")
 
 
+# ── Socket Bridge ─────────────────────────────────────────────────────
+
+def _recv_exactly(sock, size):
+    """Read exactly `size` bytes from `sock`, or return None on EOF."""
+    buf = bytearray()
+    while len(buf) < size:
+        chunk = sock.recv(size - len(buf))
+        if not chunk:
+            return None
+        buf += chunk
+    return bytes(buf)
+
+
+def _recv_frame(sock):
+    """Read one frame's payload, or return None on EOF or an oversized frame."""
+    header = _recv_exactly(sock, _FRAME_HEADER.size)
+    if header is None:
+        return None
+    (length,) = _FRAME_HEADER.unpack(header)
+    if length > MAX_FRAME_BYTES:
+        _log("monitor.txt", f"Closing bridge connection: {length}-byte frame exceeds the limit")
+        return None
+    return _recv_exactly(sock, length)
+
+
+def _send_frame(sock, message):
+    data = _json_dumps(message)
+    sock.sendall(_FRAME_HEADER.pack(len(data)) + data)
+
+
+def _authenticate(sock):
+    """Check the client's first frame carries bridge_token and acknowledge it."""
+    payload = _recv_frame(sock)
+    if payload is None:
+        return False
+    try:
+        token = _json_loads(payload).get("token")
+    except (ValueError, AttributeError):
+        token = None
+    expected = bridge_token
+    if (
+        not isinstance(token, str)
+        or expected is None
+        or not hmac.compare_digest(token.encode("utf-8"), expected.encode("utf-8"))
+    ):
+        _log("monitor.txt", "Rejected bridge connection without a valid token")
+        return False
+    _send_frame(sock, {"ok": True})
+    return True
+
+
+def _handle_frame(payload):
+    """Decode one request frame, run it, and build the response dict."""
+    try:
+        data = _json_loads(payload)
+    except (ValueError, RecursionError) as e:
+        return {"error": f"Invalid JSON: {e}"}
+    if not isinstance(data, dict):
+        return {"error": "Invalid request"}
+
+    request_id = data.get("id")
+    command = data.get("command")
+    params = data.get("params", {})
+    _log("monitor.txt", f"Processing: {command} (socket id={request_id})")
+    try:
+        response = {"result": _run_command(command, params)}
+    except Exception as e:
+        _log("monitor.txt", f"Error processing socket request {request_id}: {e}\n{traceback.format_exc()}")
+        response = {"error": str(e)}
+    if request_id is not None:
+        response["id"] = request_id
+    return response
+
+
+# Open client connections, so stopping the bridge can close them and the
+# MCP server notices and reconnects to the next bridge instead of hanging.
+_bridge_connections = set()
+_bridge_connections_lock = threading.Lock()
+
+
+class _BridgeRequestHandler(socketserver.BaseRequestHandler):
+    """Answer length-prefixed JSON requests until the client disconnects.
+
+    The first frame must be {"token": <bridge_token>}; it is answered with
+    {"ok": true}, and any other opening closes the connection.
+    """
+
+    def setup(self):
+        with _bridge_connections_lock:
+            _bridge_connections.add(self.request)
+
+    def finish(self):
+        with _bridge_connections_lock:
+            _bridge_connections.discard(self.request)
+
+    def handle(self):
+        if not _authenticate(self.request):
+            return
+        while _state.running:
+            payload = _recv_frame(self.request)
+            if payload is None:
+                return
+            _send_frame(self.request, _handle_frame(payload))
+
+
+if hasattr(socket, "AF_UNIX"):
+    class _BridgeServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+else:
+    # Windows: fall back to a loopback TCP port advertised in server_status.json.
+    class _BridgeServer(socketserver.ThreadingTCPServer):
+        daemon_threads = True
+
+
+def _bridge_address():
+    """Return the address clients should connect to, or None if not serving."""
+    if bridge_server is None:
+        return None
+    if hasattr(socket, "AF_UNIX"):
+        return bridge_server.server_address
+    return list(bridge_server.server_address[:2])
+
+
+def _fallback_socket_path():
+    """Return a per-user socket path in the local temp directory.
+
+    Used when mcp_comm/ can't hold the socket: its path is too long for
+    sun_path, or it sits on a network or synced drive that refuses
+    sockets. The directory is private to the user since any process that
+    can connect can run scripts inside Fusion.
+    """
+    sock_dir = os.path.join(tempfile.gettempdir(), f"fusion-mcp-{os.getuid()}")
+    os.makedirs(sock_dir, mode=0o700, exist_ok=True)
+    os.chmod(sock_dir, 0o700)
+    return os.path.join(sock_dir, "bridge.sock")
+
+
+def _bind_unix_bridge(path):
+    # A socket file left behind by a crash would make bind() fail.
+    if os.path.exists(path):
+        os.unlink(path)
+    server = _BridgeServer(path, _BridgeRequestHandler)
+    os.chmod(path, 0o600)
+    return server
+
+
+def _start_bridge():
+    """Bind the socket bridge and serve it on a background thread."""
+    global bridge_server, bridge_thread
+    try:
+        if hasattr(socket, "AF_UNIX"):
+            bridge_server = None
+            if len(os.fsencode(BRIDGE_SOCKET)) <= MAX_SOCKET_PATH:
+                try:
+                    bridge_server = _bind_unix_bridge(str(BRIDGE_SOCKET))
+                except OSError as e:
+                    _log("server.txt", f"Cannot bind {BRIDGE_SOCKET}: {e}")
+            if bridge_server is None:
+                bridge_server = _bind_unix_bridge(_fallback_socket_path())
+        else:
+            bridge_server = _BridgeServer(("127.0.0.1", 0), _BridgeRequestHandler)
+    except OSError as e:
+        _log("server.txt", f"Socket bridge unavailable: {e}")
+        bridge_server = None
+        return False
+
+    bridge_thread = threading.Thread(target=bridge_server.serve_forever, daemon=True)
+    bridge_thread.start()
+    _log("server.txt", f"Socket bridge listening on {_bridge_address()}")
+    return True
+
+
+def _stop_bridge():
+    global bridge_server, bridge_thread
+    if bridge_server is None:
+        return
+    address = bridge_server.server_address
+    bridge_server.shutdown()
+    bridge_server.server_close()
+    with _bridge_connections_lock:
+        for conn in _bridge_connections:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+    if hasattr(socket, "AF_UNIX"):
+        try:
+            os.unlink(address)
+        except OSError:
+            pass
+    bridge_server = None
+    bridge_thread = None
+
+
 # ── Server Lifecycle ──────────────────────────────────────────────────
 
 def start_server():
-    global server_thread, server_running
-
-    if server_running and server_thread and server_thread.is_alive():
+    global bridge_token
+    state = _state
+    if state.running and (
+        bridge_server is not None or (state.thread and state.thread.is_alive())
+    ):
         return True
 
     _ensure_comm_dir()
-    _log("server.txt", "Starting file monitor bridge")
-    _write_status("running")
+    _log("server.txt", "Starting MCP bridge")
+
+    _set_state(running=True, started=time.time(), thread=None)
+    _monitor_wake.clear()
+    bridge_token = secrets.token_hex(32)
+    socket_ok = _start_bridge()
 
-    server_running = True
-    server_thread = threading.Thread(target=_file_monitor, daemon=True)
-    server_thread.start()
+    thread = None
+    if LEGACY_FILE_TRANSPORT:
+        thread = threading.Thread(target=_file_monitor, daemon=True)
+        thread.start()
 
-    time.sleep(0.5)
-    if not server_thread.is_alive():
-        server_running = False
+        time.sleep(0.5)
+        if not thread.is_alive():
+            thread = None
+
+    if not socket_ok and thread is None:
+        _set_state(running=False)
         return False
 
-    _log("server.txt", "File monitor bridge started")
+    _set_state(thread=thread)
+    _write_status("running")
+    _log("server.txt", "MCP bridge started")
     return True
 
 
 def stop_server():
-    global server_running
-    if not server_running:
+    state = _state
+    if not state.running:
         return
-    server_running = False
+    _set_state(running=False)
+    _monitor_wake.set()
+    _stop_bridge()
     _write_status("stopped")
-    if server_thread and server_thread.is_alive():
-        server_thread.join(timeout=2.0)
+    if state.thread and state.thread.is_alive():
+        state.thread.join(timeout=2.0)
     _log("server.txt", "Server stopped")
+    _flush_logs()
 
 
 # ── Fusion 360 Add-in UI ─────────────────────────────────────────────
@@ -539,7 +1342,7 @@ class _CmdCreatedHandler(adsk.core.CommandCreatedEventHandler):
         try:
             cmd = args.command
             inputs = cmd.commandInputs
-            status = "Running" if server_running else "Not Running"
+            status = "Running" if _state.running else "Not Running"
             inputs.addTextBoxCommandInput(
                 "infoInput", "",
                 f"Click OK to start the MCP Bridge.\n\n"
@@ -549,11 +1352,11 @@ class _CmdCreatedHandler(adsk.core.CommandCreatedEventHandler):
             )
             exe = _CmdExecuteHandler()
             cmd.execute.add(exe)
-            handlers.append(exe)
+            handlers["execute"] = exe
 
             destroy = _CmdDestroyHandler()
             cmd.destroy.add(destroy)
-            handlers.append(destroy)
+            handlers["destroy"] = destroy
         except Exception:
             if ui:
                 ui.messageBox(f"Failed:\n{traceback.format_exc()}")
@@ -598,7 +1401,7 @@ def create_ui():
             )
         handler = _CmdCreatedHandler()
         cmd_def.commandCreated.add(handler)
-        handlers.append(handler)
+        handlers["created"] = handler
 
         panel = ui.allToolbarPanels.itemById("SolidScriptsAddinsPanel")
         if not panel.controls.itemById("MCPServerCommand"):
@@ -629,6 +1432,10 @@ def stop():
         ctrl = panel.controls.itemById("MCPServerCommand")
         if ctrl:
             ctrl.deleteMe()
+        _finished_message_commands.extend(message_command_handlers)
+        _release_finished_message_commands()
+        handlers.clear()
+        _close_logs()
     except Exception:
         if ui:
             ui.messageBox(f"Failed to clean up:\n{traceback.format_exc()}")
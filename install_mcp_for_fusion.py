@@ -9,20 +9,87 @@ on macOS). Instead:
 2. The MCPserve add-in folder is installed into Fusion 360 manually
 
 Usage:
-    python install_mcp_for_fusion.py
+    python install_mcp_for_fusion.py            # Set up the venv
+    python install_mcp_for_fusion.py --verify   # Also check the packages import
+    python install_mcp_for_fusion.py --link     # Also link MCPserve into Fusion 360
 """
 
 import os
 import sys
+import argparse
 import subprocess
 import platform
 import shutil
+import hashlib
+import zipfile
+import ensurepip
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from venv import EnvBuilder
 
 
 WORKSPACE = Path(__file__).resolve().parent
 VENV_DIR = WORKSPACE / "venv"
 REQUIREMENTS = WORKSPACE / "requirements.txt"
+WHEEL_CACHE = WORKSPACE / ".cache" / "wheels"
+_IS_WINDOWS = os.name == "nt"
+_VENV_PYTHON = str(
+    VENV_DIR / "Scripts" / "python.exe" if _IS_WINDOWS else VENV_DIR / "bin" / "python"
+)
+# Hash of the requirements.txt last installed into the venv.
+REQ_HASH_FILE = VENV_DIR / ".req_hash"
+
+
+def _cached_pip_wheel():
+    """Return the pip wheel bundled with this Python, cached in WHEEL_CACHE.
+
+    The cache is looked up by the bundled wheel's file name, so a wheel
+    left there by another Python version is never used. Returns None if
+    this Python ships without the bundled wheels (some Linux distributions
+    strip them).
+    """
+    bundled_dir = Path(ensurepip.__file__).parent / "_bundled"
+    bundled = next(bundled_dir.glob("pip-*.whl"), None)
+    if bundled is None:
+        return None
+    cached = WHEEL_CACHE / bundled.name
+    if cached.is_file():
+        return cached
+    try:
+        WHEEL_CACHE.mkdir(parents=True, exist_ok=True)
+        return Path(shutil.copy2(bundled, cached))
+    except OSError:
+        return bundled
+
+
+def _venv_site_packages():
+    version = f"python{sys.version_info.major}.{sys.version_info.minor}"
+    return VENV_DIR / "lib" / version / "site-packages"
+
+
+def _write_pip_launchers():
+    """Write the bin/pip, pip3 and pip3.X scripts a normal pip install creates.
+
+    Unpacking the wheel doesn't run its console_scripts entry points, and
+    without these an activated venv would pick up whatever pip is next on
+    PATH.
+    """
+    if " " in _VENV_PYTHON:
+        # Shebang lines can't quote paths; re-exec through sh instead.
+        header = f"#!/bin/sh\n'''exec' \"{_VENV_PYTHON}\" \"$0\" \"$@\"\n' '''\n"
+    else:
+        header = f"#!{_VENV_PYTHON}\n"
+    script = header + (
+        "import sys\n"
+        "from pip._internal.cli.main import main\n"
+        "if __name__ == '__main__':\n"
+        "    sys.exit(main())\n"
+    )
+    major, minor = sys.version_info[:2]
+    for name in ("pip", f"pip{major}", f"pip{major}.{minor}"):
+        launcher = VENV_DIR / "bin" / name
+        launcher.write_text(script)
+        launcher.chmod(0o755)
 
 
 def create_venv():
@@ -32,6 +99,23 @@ def create_venv():
         return True
 
     print(f"Creating virtual environment at: {VENV_DIR}")
+
+    # Building the venv in-process and unpacking pip from a wheel skips
+    # the extra interpreter and the ensurepip install that `-m venv` runs.
+    # Windows needs pip.exe launchers, which only pip itself can build, so
+    # it always takes the `-m venv` path.
+    wheel = None if _IS_WINDOWS else _cached_pip_wheel()
+    if wheel is not None:
+        try:
+            EnvBuilder(with_pip=False, symlinks=True).create(VENV_DIR)
+            with zipfile.ZipFile(wheel) as zf:
+                zf.extractall(_venv_site_packages())
+            _write_pip_launchers()
+            print("Virtual environment created.")
+            return True
+        except (OSError, zipfile.BadZipFile) as e:
+            print(f"Fast venv setup failed ({e}), falling back to python -m venv.")
+
     try:
         subprocess.run([sys.executable, "-m", "venv", str(VENV_DIR)], check=True)
         print("Virtual environment created.")
@@ -41,41 +125,88 @@ def create_venv():
         return False
 
 
-def get_venv_python():
-    """Get the path to the venv Python executable."""
-    if platform.system() == "Windows":
-        return str(VENV_DIR / "Scripts" / "python.exe")
-    return str(VENV_DIR / "bin" / "python")
+def _requirements_hash():
+    return hashlib.sha256(REQUIREMENTS.read_bytes()).hexdigest()
 
 
-def install_requirements():
-    """Install MCP packages into the venv."""
-    python = get_venv_python()
-    if not os.path.exists(python):
-        print(f"Venv Python not found at: {python}")
-        return False
+def _installed_requirements_hash():
+    try:
+        return REQ_HASH_FILE.read_text().strip()
+    except OSError:
+        return None
 
-    print(f"\nInstalling MCP packages using: {python}")
+
+def prefetch_wheels():
+    """Download wheels for requirements.txt into WHEEL_CACHE.
+
+    Runs alongside create_venv so the downloads overlap venv setup;
+    install_requirements then installs from the cache without the network.
+    """
     try:
-        result = subprocess.run(
-            [python, "-m", "pip", "install", "-r", str(REQUIREMENTS)],
+        subprocess.run(
+            [
+                sys.executable, "-m", "pip", "download",
+                "--only-binary=:all:", "--disable-pip-version-check", "--no-input",
+                "-q", "-r", str(REQUIREMENTS), "-d", str(WHEEL_CACHE),
+            ],
             capture_output=True, text=True, check=True,
         )
-        print(result.stdout)
-        if result.stderr:
-            print(result.stderr)
         return True
-    except subprocess.CalledProcessError as e:
-        print(f"Installation failed:\n{e.stdout}\n{e.stderr}")
+    except (OSError, subprocess.CalledProcessError):
         return False
 
 
+def install_requirements(prefetched=False):
+    """Install MCP packages into the venv.
+
+    With `prefetched`, pip installs only from the wheels in WHEEL_CACHE.
+    """
+    if not os.path.exists(_VENV_PYTHON):
+        print(f"Venv Python not found at: {_VENV_PYTHON}")
+        return False
+
+    req_hash = _requirements_hash()
+    if _installed_requirements_hash() == req_hash and verify_installation():
+        print("Requirements unchanged since the last install, skipping pip.")
+        return True
+
+    # uv resolves and installs much faster than pip; use it when available.
+    uv = shutil.which("uv")
+    if uv:
+        print(f"\nInstalling MCP packages with uv into: {_VENV_PYTHON}")
+        cmd = [uv, "pip", "install", "--python", _VENV_PYTHON, "-r", str(REQUIREMENTS)]
+    else:
+        print(f"\nInstalling MCP packages using: {_VENV_PYTHON}")
+        cmd = [
+            _VENV_PYTHON, "-m", "pip", "install",
+            "--prefer-binary", "--only-binary=:all:",
+            "--disable-pip-version-check", "--no-input",
+            "-r", str(REQUIREMENTS),
+        ]
+        if prefetched:
+            cmd += ["--no-index", "--find-links", str(WHEEL_CACHE)]
+    # Stream the installer's output so progress shows up as it happens.
+    try:
+        with subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1,
+        ) as proc:
+            for line in proc.stdout:
+                print(line, end="")
+    except OSError as e:
+        print(f"Installation failed: {e}")
+        return False
+    if proc.returncode:
+        print(f"Installation failed (exit code {proc.returncode}).")
+        return False
+    REQ_HASH_FILE.write_text(req_hash)
+    return True
+
+
 def verify_installation():
     """Verify that MCP packages are importable."""
-    python = get_venv_python()
     try:
         result = subprocess.run(
-            [python, "-c", (
+            [_VENV_PYTHON, "-I", "-c", (
                 "from mcp.server.fastmcp import FastMCP; "
                 "import uvicorn; "
                 "print('All packages verified successfully!')"
@@ -95,50 +226,79 @@ def verify_installation():
 
 def find_fusion_addins_folder():
     """Find the Fusion 360 add-ins folder for the current platform."""
-    system = platform.system()
-    if system == "Darwin":
-        candidates = [
-            Path.home() / "Library" / "Application Support" / "Autodesk"
-            / "Autodesk Fusion" / "API" / "AddIns",
-            Path.home() / "Library" / "Application Support" / "Autodesk"
-            / "Autodesk Fusion 360" / "API" / "AddIns",
-        ]
-    elif system == "Windows":
-        candidates = [
-            Path(os.environ.get("APPDATA", "")) / "Autodesk"
-            / "Autodesk Fusion" / "API" / "AddIns",
-            Path(os.environ.get("APPDATA", "")) / "Autodesk"
-            / "Autodesk Fusion 360" / "API" / "AddIns",
-        ]
+    if sys.platform == "darwin":
+        autodesk = Path.home() / "Library" / "Application Support" / "Autodesk"
+    elif _IS_WINDOWS:
+        autodesk = Path(os.environ.get("APPDATA", "")) / "Autodesk"
     else:
         return None
 
-    for path in candidates:
-        if path.exists():
+    # One directory listing instead of probing each product name in turn.
+    try:
+        with os.scandir(autodesk) as entries:
+            names = {entry.name.lower(): entry.name for entry in entries}
+    except OSError:
+        return None
+
+    for product in ("Autodesk Fusion", "Autodesk Fusion 360"):
+        name = names.get(product.lower())
+        if name is None:
+            continue
+        path = autodesk / name / "API" / "AddIns"
+        if path.is_dir():
             return path
     return None
 
 
-def print_addin_instructions():
-    """Print instructions for installing the Fusion 360 add-in."""
+def link_addin(addins_folder):
+    """Link the MCPserve folder into the Fusion 360 add-ins folder."""
+    target = addins_folder / "MCPserve"
+    source = WORKSPACE / "MCPserve"
+    if target.exists() or target.is_symlink():
+        print(f"\nAdd-in already present at:\n  {target}")
+        return True
+    try:
+        if _IS_WINDOWS:
+            # A directory junction, unlike a symlink, doesn't need admin rights.
+            subprocess.run(
+                ["cmd", "/c", "mklink", "/J", str(target), str(source)],
+                capture_output=True, text=True, check=True,
+            )
+        else:
+            os.symlink(source, target, target_is_directory=True)
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"\nCould not link the add-in: {e}")
+        return False
+    print(f"\nLinked add-in:\n  {target} -> {source}")
+    return True
+
+
+def print_addin_instructions(link=False):
+    """Print instructions for installing the Fusion 360 add-in.
+
+    With `link`, the add-in is linked into the detected add-ins folder
+    instead of printing the manual steps.
+    """
     addins_folder = find_fusion_addins_folder()
 
     print("\n" + "=" * 60)
     print("FUSION 360 ADD-IN INSTALLATION")
     print("=" * 60)
 
-    if addins_folder:
+    if addins_folder and link and link_addin(addins_folder):
+        print("It is listed under Tools > Add-Ins > Scripts and Add-Ins in Fusion 360.")
+    elif addins_folder:
         target = addins_folder / "MCPserve"
         source = WORKSPACE / "MCPserve"
         print(f"\nDetected Fusion 360 add-ins folder:\n  {addins_folder}")
         print(f"\nTo install the add-in, you can either:")
         print(f"\n  Option A: Create a symlink (recommended for development):")
-        if platform.system() == "Windows":
+        if _IS_WINDOWS:
             print(f'    mklink /D "{target}" "{source}"')
         else:
             print(f'    ln -s "{source}" "{target}"')
         print(f"\n  Option B: Copy the folder:")
-        if platform.system() == "Windows":
+        if _IS_WINDOWS:
             print(f'    xcopy /E /I "{source}" "{target}"')
         else:
             print(f'    cp -r "{source}" "{target}"')
@@ -158,6 +318,17 @@ def print_addin_instructions():
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Set up the Fusion 360 MCP Server")
+    parser.add_argument(
+        "--verify", action="store_true",
+        help="Check that the MCP packages import after installing them",
+    )
+    parser.add_argument(
+        "--link", action="store_true",
+        help="Link MCPserve into the Fusion 360 add-ins folder if it is found",
+    )
+    args = parser.parse_args()
+
     print("=" * 60)
     print("Fusion 360 MCP Server - Setup")
     print("=" * 60)
@@ -166,20 +337,28 @@ def main():
     print()
 
     print("STEP 1: Setting up virtual environment...")
-    if not create_venv():
+    # uv has its own fast cache, and unchanged requirements skip pip
+    # entirely, so only prefetch wheels when pip is going to download.
+    prefetch = shutil.which("uv") is None and _installed_requirements_hash() != _requirements_hash()
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        prefetched = pool.submit(prefetch_wheels) if prefetch else None
+        venv_ok = create_venv()
+        prefetched = prefetched is not None and prefetched.result()
+    if not venv_ok:
         print("Failed to create virtual environment. Aborting.")
         return
 
     print("\nSTEP 2: Installing MCP packages...")
-    if not install_requirements():
+    if not install_requirements(prefetched=prefetched):
         print("Failed to install packages. Aborting.")
         return
 
-    print("\nSTEP 3: Verifying installation...")
-    if not verify_installation():
-        print("Verification failed, but packages may still work. Continuing.")
+    if args.verify:
+        print("\nSTEP 3: Verifying installation...")
+        if not verify_installation():
+            print("Verification failed, but packages may still work. Continuing.")
 
-    print_addin_instructions()
+    print_addin_instructions(link=args.link)
 
     print("\n" + "=" * 60)
     print("Setup complete!")
@@ -3,12 +3,14 @@
 Standalone MCP Server for Fusion 360
 
 Runs as a separate process (outside Fusion 360) and bridges MCP protocol
-requests to Fusion 360 via file-based communication in the mcp_comm/ directory.
+requests to the Fusion 360 add-in.
 
-The Fusion 360 add-in monitors mcp_comm/ for command files, executes them
-using the Fusion 360 API, and writes response files. This server translates
-MCP tool/resource/prompt calls into those file-based commands and waits
-for responses.
+The add-in listens on a local socket advertised in mcp_comm/server_status.json
+and answers length-prefixed JSON requests using the Fusion 360 API. This
+server translates MCP tool/resource/prompt calls into those requests over a
+single persistent connection. If the socket is unavailable it falls back to
+the older file-based protocol: command files written to mcp_comm/ and
+response files written back by the add-in.
 
 Usage:
     python mcp_server.py              # Run with SSE transport (default)
@@ -16,21 +18,55 @@ Usage:
     python mcp_server.py --port 3000  # Custom port for SSE
 """
 
+import os
 import json
 import time
+import struct
 import argparse
 import asyncio
+import itertools
 from pathlib import Path
 from typing import Any
 
 from mcp.server.fastmcp import FastMCP
 
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+    _json_loads = json.loads
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    from watchfiles import Change, awatch
+except ImportError:
+    awatch = None
+
 WORKSPACE_DIR = Path(__file__).resolve().parent
 COMM_DIR = WORKSPACE_DIR / "mcp_comm"
 COMM_DIR.mkdir(parents=True, exist_ok=True)
+# String form for building per-command file paths without Path objects.
+_COMM_DIR = str(COMM_DIR)
 
 COMMAND_TIMEOUT = 15.0
-POLL_INTERVAL = 0.1
+# Bounds of the backoff between checks for a response file. The interval
+# starts small so fast commands return quickly and grows by POLL_BACKOFF up
+# to MAX_POLL_INTERVAL for slow ones. With watchfiles installed the waiter
+# is normally woken as soon as the file appears instead.
+MIN_POLL_INTERVAL = 0.001
+MAX_POLL_INTERVAL = 0.05
+POLL_BACKOFF = 1.5
+STATUS_CACHE_SECONDS = 1.0
+# How long answered command/response files wait before being deleted in
+# one batch.
+GC_INTERVAL = 0.2
 
 _parser = argparse.ArgumentParser(description="Fusion 360 MCP Server")
 _parser.add_argument("--stdio", action="store_true", help="Use stdio transport instead of SSE")
@@ -38,46 +74,475 @@ _parser.add_argument("--host", default="127.0.0.1", help="Host for SSE server (d
 _parser.add_argument("--port", type=int, default=3000, help="Port for SSE server (default: 3000)")
 _args = _parser.parse_args()
 
+if not _args.stdio:
+    # Load the SSE server stack now rather than when the first client
+    # connects; the stdio transport doesn't need it at all.
+    import uvicorn
+
+
+def _write_bytes_atomic(path: str, data: bytes) -> None:
+    """Write `data` to a temp file and rename it into place.
+
+    The add-in reacts to the file appearing, so it must never observe a
+    partially written command. Payloads are small, so a raw os.write skips
+    setting up a buffered file object.
+    """
+    tmp = f"{path}.tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    os.replace(tmp, path)
+
+
+def _atomic_write_json(path: str, payload: dict) -> None:
+    """Write JSON to `path` atomically."""
+    _write_bytes_atomic(path, _json_dumps(payload))
+
+
+def _atomic_write_msgpack(path: str, payload: dict) -> None:
+    """Write MessagePack to `path` atomically."""
+    _write_bytes_atomic(path, msgpack.packb(payload, use_bin_type=True))
+
+
+def _read_file(path: str) -> bytes:
+    """Read a whole file with raw os calls; raises FileNotFoundError if absent."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        chunks = []
+        while chunk := os.read(fd, 1 << 20):
+            chunks.append(chunk)
+        return b"".join(chunks)
+    finally:
+        os.close(fd)
+
+
+# Fire-and-forget tasks; the event loop only keeps weak references, so hold
+# them here until they finish.
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _spawn(coro) -> asyncio.Task:
+    """Start `coro` as a task that stays referenced until it is done."""
+    task = asyncio.get_running_loop().create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+# Files of answered commands, deleted in batches by _gc_files.
+_gc_pending: list[tuple[str, ...]] = []
+_gc_task: asyncio.Task | None = None
+
+
+def _schedule_cleanup(*paths: str | tuple[str, ...]) -> None:
+    """Delete `paths` in the next GC batch.
+
+    Each argument is deleted as the first of its alternatives that exists,
+    so a command file is passed as (processed_command_..., command_...).
+    """
+    global _gc_task
+    _gc_pending.extend(p if isinstance(p, tuple) else (p,) for p in paths)
+    if _gc_task is None or _gc_task.done():
+        _gc_task = asyncio.get_running_loop().create_task(_gc_files())
+
+
+async def _gc_files() -> None:
+    while _gc_pending:
+        await asyncio.sleep(GC_INTERVAL)
+        batch = _gc_pending[:]
+        del _gc_pending[:len(batch)]
+        for alternatives in batch:
+            for path in alternatives:
+                try:
+                    os.unlink(path)
+                    break
+                except FileNotFoundError:
+                    continue
+                except OSError:
+                    break
+
+
+def _read_status() -> dict | None:
+    """Return the add-in's server_status.json, or None if it can't be read."""
+    try:
+        return _json_loads((COMM_DIR / "server_status.json").read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+# (monotonic time, contents) of the last _cached_status() read.
+_status_cache: tuple[float, dict | None] = (float("-inf"), None)
+
+
+def _cached_status(refresh: bool = False) -> dict | None:
+    """Return server_status.json, re-reading it at most every STATUS_CACHE_SECONDS.
+
+    Capability checks run on every file-transport command; the add-in only
+    rewrites the file when it starts or stops. `refresh` forces a re-read.
+    """
+    global _status_cache
+    now = time.monotonic()
+    read_at, status = _status_cache
+    if refresh or now - read_at >= STATUS_CACHE_SECONDS:
+        status = _read_status()
+        _status_cache = (now, status)
+    return status
+
+
+def _use_batches() -> bool:
+    """Whether the add-in accepts batch_<id> files holding several commands."""
+    status = _cached_status() or {}
+    return bool(status.get("batch_commands"))
+
+
+def _use_msgpack() -> bool:
+    """Whether both this process and the add-in can exchange MessagePack files."""
+    if msgpack is None:
+        return False
+    status = _cached_status() or {}
+    return "msgpack" in status.get("payload_formats", ())
+
+
+# File command ids are "<pid>_<n>" so concurrent calls and concurrent
+# server processes never share a file name. The counter starts at the
+# launch time in ms so a restarted server that reuses a PID doesn't pick
+# ids the add-in already recorded as handled.
+_PID = os.getpid()
+_CMD_COUNTER = itertools.count(int(time.time() * 1000))
+
+# command_id (or "batch_<id>") -> Event set by _watch_responses when the
+# matching response file appears.
+_response_events: dict[str, asyncio.Event] = {}
+_response_watcher: asyncio.Task | None = None
+
+
+def _is_response_file(change: "Change", path: str) -> bool:
+    name = os.path.basename(path)
+    return change != Change.deleted and (
+        name.startswith("response_") or name.startswith("batch_response_")
+    )
+
+
+async def _watch_responses() -> None:
+    """Wake the send_command waiting on each response file as it is written."""
+    async for changes in awatch(
+        COMM_DIR, watch_filter=_is_response_file, debounce=50, step=1, recursive=False
+    ):
+        for _, path in changes:
+            # response_<id> wakes "<id>", batch_response_<id> wakes "batch_<id>".
+            stem = os.path.splitext(os.path.basename(path))[0]
+            event = _response_events.get(stem.replace("response_", "", 1))
+            if event is not None:
+                event.set()
+
+
+def _ensure_response_watcher() -> None:
+    """Start the shared response watcher task if it isn't running."""
+    global _response_watcher
+    if awatch is None:
+        return
+    if _response_watcher is None or _response_watcher.done():
+        _response_watcher = asyncio.get_running_loop().create_task(_watch_responses())
+
+
+# --- Socket transport ---
+
+# Frame header: payload length as a little-endian unsigned 32-bit int.
+_FRAME_HEADER = struct.Struct("<I")
+
+# How long the add-in has to acknowledge the token on a new connection.
+BRIDGE_AUTH_TIMEOUT = 2.0
+
+_bridge_writer: asyncio.StreamWriter | None = None
+_bridge_pending: dict[int, asyncio.Future] = {}
+_bridge_ids = itertools.count(1)
+_bridge_connect_lock = asyncio.Lock()
+
+
+async def _connect_bridge() -> bool:
+    """Open the connection to the add-in's socket bridge if needed.
+
+    Returns False when the add-in isn't advertising a bridge or it can't be
+    reached, so the caller can fall back to file-based commands.
+    """
+    global _bridge_writer
+    if _bridge_writer is not None:
+        return True
+    async with _bridge_connect_lock:
+        if _bridge_writer is not None:
+            return True
+        status = _cached_status() or {}
+        if status.get("status") != "running" or not status.get("bridge_address"):
+            return False
+        connection = await _open_bridge(status)
+        if connection is None:
+            # The cached status may predate an add-in restart (new address
+            # or token), so retry once against a fresh read.
+            connection = await _open_bridge(_cached_status(refresh=True) or {})
+            if connection is None:
+                return False
+        reader, _bridge_writer = connection
+        _spawn(_read_bridge_responses(reader, _bridge_writer))
+        return True
+
+
+async def _open_bridge(
+    status: dict,
+) -> tuple[asyncio.StreamReader, asyncio.StreamWriter] | None:
+    """Connect and authenticate to the bridge `status` advertises, or return None."""
+    address = status.get("bridge_address")
+    if status.get("status") != "running" or not address:
+        return None
+    try:
+        if isinstance(address, str):
+            reader, writer = await asyncio.open_unix_connection(address)
+        else:
+            reader, writer = await asyncio.open_connection(*address)
+    except OSError:
+        return None
+    if not await _authenticate_bridge(reader, writer, status.get("bridge_token")):
+        writer.close()
+        return None
+    return reader, writer
+
+
+async def _authenticate_bridge(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter, token: str | None
+) -> bool:
+    """Present the add-in's token as the first frame and wait for its ack."""
+    if not token:
+        return False
+    try:
+        payload = _json_dumps({"token": token})
+        writer.write(_FRAME_HEADER.pack(len(payload)) + payload)
+        await writer.drain()
+        header = await asyncio.wait_for(reader.readexactly(_FRAME_HEADER.size), BRIDGE_AUTH_TIMEOUT)
+        (length,) = _FRAME_HEADER.unpack(header)
+        reply = _json_loads(await asyncio.wait_for(reader.readexactly(length), BRIDGE_AUTH_TIMEOUT))
+    except (asyncio.IncompleteReadError, asyncio.TimeoutError, OSError, ValueError):
+        return False
+    return isinstance(reply, dict) and reply.get("ok") is True
+
+
+async def _read_bridge_responses(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Resolve pending requests as response frames arrive on the connection."""
+    global _bridge_writer
+    try:
+        while True:
+            (length,) = _FRAME_HEADER.unpack(await reader.readexactly(_FRAME_HEADER.size))
+            response = _json_loads(await reader.readexactly(length))
+            future = _bridge_pending.pop(response.pop("id", None), None)
+            if future is not None and not future.done():
+                future.set_result(response)
+    except (asyncio.IncompleteReadError, OSError, ValueError):
+        pass
+    finally:
+        if _bridge_writer is writer:
+            _bridge_writer = None
+        writer.close()
+        for future in _bridge_pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Lost connection to the Fusion 360 add-in."))
+        _bridge_pending.clear()
+
+
+async def _send_over_bridge(command: str, params: dict, timeout: float) -> dict:
+    """Send one request frame over the bridge and wait for its response."""
+    request_id = next(_bridge_ids)
+    future = asyncio.get_running_loop().create_future()
+    _bridge_pending[request_id] = future
+    try:
+        payload = _json_dumps({"id": request_id, "command": command, "params": params})
+        _bridge_writer.write(_FRAME_HEADER.pack(len(payload)) + payload)
+        await _bridge_writer.drain()
+        return await asyncio.wait_for(future, timeout)
+    except asyncio.TimeoutError:
+        raise _timeout_error(command, timeout) from None
+    finally:
+        _bridge_pending.pop(request_id, None)
+
+
+def _unwrap_response(response: dict) -> Any:
+    if "error" in response:
+        raise RuntimeError(response["error"])
+    return response.get("result")
+
 
 async def send_command(command: str, params: dict | None = None, timeout: float = COMMAND_TIMEOUT) -> Any:
-    """Send a command to Fusion 360 via file-based communication and wait for a response."""
+    """Send a command to Fusion 360 and wait for a response.
+
+    Uses the add-in's socket bridge when it is listening, and command files
+    in mcp_comm/ otherwise.
+    """
     if params is None:
         params = {}
 
-    command_id = str(int(time.time() * 1000))
-    command_file = COMM_DIR / f"command_{command_id}.json"
-    response_file = COMM_DIR / f"response_{command_id}.json"
+    if await _connect_bridge():
+        return _unwrap_response(await _send_over_bridge(command, params, timeout))
+    if _use_batches():
+        return await _send_via_batch(command, params, timeout)
+    return await _send_via_files(command, params, timeout)
 
-    command_file.write_text(json.dumps({"command": command, "params": params}, indent=2))
 
-    start = time.monotonic()
-    while time.monotonic() - start < timeout:
-        if response_file.exists():
-            try:
-                response = json.loads(response_file.read_text())
-                if "error" in response:
-                    raise RuntimeError(response["error"])
-                return response.get("result")
-            except json.JSONDecodeError:
-                await asyncio.sleep(POLL_INTERVAL)
-                continue
-        await asyncio.sleep(POLL_INTERVAL)
-
-    raise TimeoutError(
+def _timeout_error(command: str, timeout: float) -> TimeoutError:
+    return TimeoutError(
         f"Fusion 360 did not respond to '{command}' within {timeout}s. "
         "Make sure the Fusion 360 add-in is running."
     )
 
 
-def check_fusion_addin_running() -> bool:
-    """Check if the Fusion 360 add-in appears to be running."""
-    status_file = COMM_DIR / "server_status.json"
-    if status_file.exists():
+# --- File transport (fallback) ---
+
+async def _wait_for_response_file(
+    response_file: str, event: asyncio.Event, use_msgpack: bool, timeout: float
+) -> dict | None:
+    """Wait for `response_file` to appear and decode it; None on timeout.
+
+    `event` is set by the watchfiles watcher when the file is written; the
+    backoff below only matters when that watcher is missing or misses it.
+    """
+    start = time.monotonic()
+    interval = MIN_POLL_INTERVAL
+    while time.monotonic() - start < timeout:
+        # Clear before checking so a wakeup that lands mid-check isn't lost.
+        event.clear()
         try:
-            status = json.loads(status_file.read_text())
-            return status.get("status") == "running"
-        except Exception:
+            raw = _read_file(response_file)
+            return msgpack.unpackb(raw) if use_msgpack else _json_loads(raw)
+        except (FileNotFoundError, ValueError):
             pass
+        try:
+            await asyncio.wait_for(event.wait(), interval)
+        except asyncio.TimeoutError:
+            interval = min(interval * POLL_BACKOFF, MAX_POLL_INTERVAL)
+    return None
+
+
+async def _send_via_files(command: str, params: dict, timeout: float) -> Any:
+    """Send a command as a file in mcp_comm/ and wait for its response file."""
+    use_msgpack = _use_msgpack()
+    ext = ".msgpack" if use_msgpack else ".json"
+    command_id = f"{_PID}_{next(_CMD_COUNTER)}"
+    command_file = f"{_COMM_DIR}/command_{command_id}{ext}"
+    response_file = f"{_COMM_DIR}/response_{command_id}{ext}"
+
+    event = asyncio.Event()
+    _response_events[command_id] = event
+    _ensure_response_watcher()
+    try:
+        payload = {"command": command, "params": params}
+        if use_msgpack:
+            _atomic_write_msgpack(command_file, payload)
+        else:
+            _atomic_write_json(command_file, payload)
+        response = await _wait_for_response_file(response_file, event, use_msgpack, timeout)
+    finally:
+        _response_events.pop(command_id, None)
+
+    if response is None:
+        raise _timeout_error(command, timeout)
+    processed_file = f"{_COMM_DIR}/processed_command_{command_id}{ext}"
+    _schedule_cleanup(response_file, (processed_file, command_file))
+    return _unwrap_response(response)
+
+
+# --- Batched file transport ---
+
+# How long the batch writer waits after the first queued command to collect
+# the others issued alongside it.
+BATCH_WINDOW = 0.005
+
+# (command, params, timeout, future) tuples waiting for the next batch.
+_batch_queue: asyncio.Queue | None = None
+_batch_writer: asyncio.Task | None = None
+
+
+async def _send_via_batch(command: str, params: dict, timeout: float) -> Any:
+    """Queue a command for the next batch file and wait for its response."""
+    global _batch_queue, _batch_writer
+    if _batch_queue is None:
+        _batch_queue = asyncio.Queue()
+    if _batch_writer is None or _batch_writer.done():
+        _batch_writer = asyncio.get_running_loop().create_task(_write_batches())
+
+    future = asyncio.get_running_loop().create_future()
+    _batch_queue.put_nowait((command, params, timeout, future))
+    try:
+        return _unwrap_response(await asyncio.wait_for(future, timeout))
+    except asyncio.TimeoutError:
+        raise _timeout_error(command, timeout) from None
+
+
+async def _write_batches() -> None:
+    """Collect queued commands every BATCH_WINDOW and send each lot as one file."""
+    while True:
+        batch = [await _batch_queue.get()]
+        await asyncio.sleep(BATCH_WINDOW)
+        while not _batch_queue.empty():
+            batch.append(_batch_queue.get_nowait())
+        _spawn(_run_batch(batch))
+
+
+async def _run_batch(batch: list[tuple]) -> None:
+    """Write one batch_<id> file and resolve its futures from batch_response_<id>."""
+    use_msgpack = _use_msgpack()
+    ext = ".msgpack" if use_msgpack else ".json"
+    batch_id = f"{_PID}_{next(_CMD_COUNTER)}"
+    batch_file = f"{_COMM_DIR}/batch_{batch_id}{ext}"
+    response_file = f"{_COMM_DIR}/batch_response_{batch_id}{ext}"
+    futures = [future for *_, future in batch]
+
+    event = asyncio.Event()
+    _response_events[f"batch_{batch_id}"] = event
+    _ensure_response_watcher()
+    try:
+        payload = {"commands": [
+            {"id": i, "command": command, "params": params}
+            for i, (command, params, _, _) in enumerate(batch)
+        ]}
+        if use_msgpack:
+            _atomic_write_msgpack(batch_file, payload)
+        else:
+            _atomic_write_json(batch_file, payload)
+        # Callers time out on their own; wait as long as the most patient one.
+        timeout = max(timeout for _, _, timeout, _ in batch)
+        response = await _wait_for_response_file(response_file, event, use_msgpack, timeout)
+    except OSError as e:
+        for future in futures:
+            if not future.done():
+                future.set_exception(e)
+        return
+    finally:
+        _response_events.pop(f"batch_{batch_id}", None)
+
+    if response is None:
+        return
+    processed_file = f"{_COMM_DIR}/processed_batch_{batch_id}{ext}"
+    _schedule_cleanup(response_file, (processed_file, batch_file))
+    if "error" in response:
+        for future in futures:
+            if not future.done():
+                future.set_exception(RuntimeError(response["error"]))
+        return
+    for item in response.get("responses", ()):
+        i = item.pop("id", None)
+        if isinstance(i, int) and 0 <= i < len(futures) and not futures[i].done():
+            futures[i].set_result(item)
+
+
+def check_fusion_addin_running() -> bool:
+    """Check if the Fusion 360 add-in appears to be running.
+
+    Uses the cached status read, so bursts of tool calls don't each
+    re-read server_status.json.
+    """
+    status = _cached_status()
+    if status is not None:
+        return status.get("status") == "running"
     return (COMM_DIR / "client_ready.txt").exists()
 
 
@@ -275,7 +740,17 @@ def main():
         fusion_mcp.run(transport="stdio")
     else:
         print(f"Starting Fusion 360 MCP server at http://{_args.host}:{_args.port}/sse ...")
-        fusion_mcp.run(transport="sse")
+        # Serve the SSE app ourselves rather than via fusion_mcp.run(), which
+        # doesn't expose uvicorn's options, so the per-request access log
+        # can be switched off.
+        config = uvicorn.Config(
+            fusion_mcp.sse_app(),
+            host=_args.host,
+            port=_args.port,
+            log_level=fusion_mcp.settings.log_level.lower(),
+            access_log=False,
+        )
+        uvicorn.Server(config).run()
 
 
 if __name__ == "__main__":